@@ -6,20 +6,47 @@ This avoids hio's TCP client and uses only the HTTP message build/parse logic.
 """
 
 import json
-import copy
-import random
+import secrets
 
-from collections import deque
-from urllib.parse import urlsplit, quote, quote_plus, unquote, unquote_plus
+from urllib.parse import urlsplit, quote, quote_plus
 
 from hio.help import Hict
 from hio.core.http import httping
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # optional, json.dumps fallback below
+
 
 CRLF = b"\r\n"
 LF = b"\n"
 CR = b"\r"
 
+DEFAULT_PORTS = {u'http': httping.HTTP_PORT, u'https': httping.HTTPS_PORT}
+
+# characters that make a path need urlsplit, urlsplit also drops tab/CR/LF
+URL_SPLIT_CHARS = frozenset(u'?#\t\r\n')
+
+# title cased and encoded name prefixes of the headers build() adds itself
+# keyed by the lowercase name it inserts so packHeader is skipped for them
+HEADER_PREFIXES = {
+    u'host': b'Host: ',
+    u'accept-encoding': b'Accept-Encoding: ',
+    u'content-type': b'Content-Type: ',
+    u'content-length': b'Content-Length: ',
+}
+
+
+def dumpJson(data):
+    """
+    Returns utf-8 encoded JSON serialization of data as bytes.
+    Uses orjson when available since it serializes straight to bytes.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data).encode('utf-8')
+
 
 class Requester(object):
     """
@@ -55,9 +82,9 @@ class Requester(object):
         self.fargs = fargs
         self.portOptional = True if portOptional else False
 
-        self.lines = []  # keep around for testing
-        self.head = b""  # keep around for testing
         self.msg = b""
+        self._headLen = 0  # length of head portion of .msg
+        self._key = None  # ._inputs() snapshot .msg was built from
 
     def reinit(self,
                hostname=None,
@@ -99,6 +126,14 @@ class Requester(object):
         if portOptional is not None:
             self.portOptional = True if portOptional else False
 
+    @property
+    def head(self):
+        """
+        Head portion (start line and headers) of last built .msg
+        Sliced on access so build() never copies it separately.
+        """
+        return self.msg[:self._headLen]
+
     def rebuild(self,
                 hostname=None,
                 port=None,
@@ -120,91 +155,102 @@ class Requester(object):
                         path=path, qargs=qargs, fragment=fragment, headers=headers,
                         body=body, data=data, fargs=fargs, portOptional=portOptional)
 
+        key = self._inputs()
+        if key is not None and key == self._key:  # same inputs as last build
+            return self.msg
         return self.build()
 
+    def _inputs(self):
+        """
+        Returns snapshot of the attributes .build() reads, so attributes
+        assigned or mutated directly are seen by .rebuild()
+        Returns None when .data or .fargs is set since snapshotting them
+        would cost about as much as serializing them in .build()
+        """
+        if self.data is not None or self.fargs is not None:
+            return None
+        return (self.hostname, self.port, self.scheme, self.method, self.path,
+                tuple((key, str(val)) for key, val in self.qargs.items()),
+                tuple(self.headers.items()), bytes(self.body))
+
     def build(self):
         """
         Build and return request message from attributes.
         """
-        self.lines = []
+        buf = bytearray()
 
-        pathSplits = urlsplit(self.path)
-        path = pathSplits.path
-        self.path = path
-        path = quote(path)
+        path = self.path
+        if path[:1] == u'/' and path[:2] != u'//' and not URL_SPLIT_CHARS.intersection(path):
+            query = u''  # plain absolute path so nothing for urlsplit to split off
+        else:
+            pathSplits = urlsplit(path)
+            path = pathSplits.path
 
-        scheme = pathSplits.scheme
-        if scheme and scheme != self.scheme:
-            raise ValueError("Already open connection attempt to change scheme  "
-                             " to '{0}'".format(scheme))
+            scheme = pathSplits.scheme
+            if scheme and scheme != self.scheme:
+                raise ValueError("Already open connection attempt to change scheme  "
+                                 " to '{0}'".format(scheme))
 
-        port = pathSplits.port
-        if port and port != self.port:
-            raise ValueError("Already open connection attempt to change port  "
-                             " to '{0}'".format(port))
+            port = pathSplits.port
+            if port and port != self.port:
+                raise ValueError("Already open connection attempt to change port  "
+                                 " to '{0}'".format(port))
 
-        hostname = pathSplits.hostname
-        if hostname and hostname != self.hostname:
-            raise ValueError("Already open connection attempt to change hostname  "
-                             " to '{0}'".format(hostname))
+            hostname = pathSplits.hostname
+            if hostname and hostname != self.hostname:
+                raise ValueError("Already open connection attempt to change hostname  "
+                                 " to '{0}'".format(hostname))
 
-        query = pathSplits.query
-        self.qargs, query = httping.updateQargsQuery(self.qargs, query)
+            query = pathSplits.query
 
-        fragment = pathSplits.fragment
-        if fragment:
-            self.fragment = fragment
+            fragment = pathSplits.fragment
+            if fragment:
+                self.fragment = fragment
+
+        self.path = path
+        path = quote(path)
+        self.qargs, query = httping.updateQargsQuery(self.qargs, query)
 
-        combine = u"{0}?{1}#".format(path, query, fragment)
-        combine = urlsplit(combine).geturl()
+        # request target is path plus query, fragment is never sent
+        combine = u"{0}?{1}".format(path, query) if query else path
 
         startLine = "{0} {1} {2}".format(self.method, combine, self.HttpVersionString)
         try:
             startLine = startLine.encode('ascii')
         except UnicodeEncodeError:
             startLine = startLine.encode('idna')
-        self.lines.append(startLine)
+        buf += startLine
+        buf += CRLF
 
         if u'host' not in self.headers:
             host = self.hostname
             port = self.port
-            if not self.portOptional:
-                if ((self.scheme == u'http' and port != 80) or
-                        (self.scheme == u'https' and port != 443)):
-                    host = "{0}:{1}".format(host, port)
-                self.headers[u'host'] = host
-            else:
-                if ((self.scheme == u'http' and port != 80) or
-                        (self.scheme == u'https' and port != 443)):
-                    host = "{0}:{1}".format(host, port)
-                self.headers[u'host'] = host
+            if DEFAULT_PORTS.get(self.scheme, port) != port:
+                host = "{0}:{1}".format(host, port)
+            self.headers[u'host'] = host
 
         if u'accept-encoding' not in self.headers:
             self.headers[u'accept-encoding'] = u'identity'
 
         body = b""
         if self.data is not None:
-            body = json.dumps(self.data).encode('utf-8')
+            body = dumpJson(self.data)
             self.headers[u'content-type'] = u'application/json; charset=utf-8'
         elif self.fargs is not None:
             if any(isinstance(val, (tuple, list)) for val in self.fargs.values()):
-                boundary = "---%s" % random.randrange(1e9)
-                formParts = []
+                boundary = "---{0}".format(secrets.token_hex(16))
+                delimiter = b'--' + boundary.encode('ascii')
+                form = bytearray()
                 for key, val in self.fargs.items():
-                    if isinstance(val, (tuple, list)):
-                        for v in val:
-                            formParts.append('--{0}\r\n'
-                                             'Content-Disposition: form-data; name="{1}"\r\n'
-                                             'Content-Type: text/plain; charset=utf-8\r\n'
-                                             '\r\n{2}'.format(boundary, key, v))
-                    else:
-                        formParts.append('--{0}\r\n'
-                                         'Content-Disposition: form-data; name="{1}"\r\n'
-                                         'Content-Type: text/plain; charset=utf-8\r\n'
-                                         '\r\n{2}'.format(boundary, key, val))
-                formParts.append('\r\n--{0}--'.format(boundary))
-                form = "".join(formParts)
-                body = form.encode(encoding='utf-8')
+                    partHead = (delimiter +
+                                b'\r\nContent-Disposition: form-data; name="' +
+                                str(key).encode('utf-8') +
+                                b'"\r\nContent-Type: text/plain; charset=utf-8\r\n\r\n')
+                    for v in (val if isinstance(val, (tuple, list)) else (val, )):
+                        form += partHead
+                        form += str(v).encode('utf-8')
+                form += CRLF + delimiter + b'--'
+                body = bytes(form)
                 self.headers[u'content-type'] = u'multipart/form-data; boundary={0}'.format(boundary)
             else:
                 formParts = [u"{0}={1}".format(key, val) for key, val in self.fargs.items()]
@@ -216,14 +262,24 @@ class Requester(object):
             body = self.body
 
         if body and (u'content-length' not in self.headers):
-            self.lines.append(httping.packHeader(u'Content-Length', str(len(body))))
+            buf += HEADER_PREFIXES[u'content-length']
+            buf += str(len(body)).encode('ascii')
+            buf += CRLF
 
         for name, value in self.headers.items():
-            self.lines.append(httping.packHeader(name, value))
-
-        self.lines.extend((b"", b""))
-        self.head = CRLF.join(self.lines)
-        self.msg = self.head + body
+            prefix = HEADER_PREFIXES.get(name)
+            if prefix is not None and isinstance(value, str):
+                buf += prefix
+                buf += value.encode('iso-8859-1')
+            else:
+                buf += httping.packHeader(name, value)
+            buf += CRLF
+
+        buf += CRLF
+        self._headLen = len(buf)
+        buf += body
+        self.msg = bytes(buf)
+        self._key = self._inputs()  # after build's own header and path updates
         return self.msg
 
 
@@ -252,7 +308,7 @@ class Respondent(httping.Parsent):
         self.redirectable = True if redirectable else False
 
         self.evented = None
-        self.events = events if events is not None else deque()
+        self.events = events if events is not None else []  # appended by eventSource
         self.retry = retry if retry is not None else self.Retry
         self.leid = None
         self.eventSource = None
@@ -316,7 +372,10 @@ class Respondent(httping.Parsent):
         else:
             raise httping.UnknownProtocol(version)
 
-        leaderParser = httping.parseLeader(raw=self.msg, eols=(CRLF, LF), kind="leader header line")
+        # parse straight into .headers instead of a throwaway cimdict
+        leaderParser = httping.parseLeader(raw=self.msg, eols=(CRLF, LF),
+                                           kind="leader header line",
+                                           headers=self.headers)
         while True:
             if self.closed and not self.msg:
                 raise httping.PrematureClosure("Connection closed unexpectedly while parsing response header")
@@ -325,9 +384,6 @@ class Respondent(httping.Parsent):
                 leaderParser.close()
                 break
             (yield None)
-        if self.headers is None:
-            self.headers = Hict()
-        self.headers.update(headers)
 
         transferEncoding = self.headers.get("transfer-encoding")
         if transferEncoding and transferEncoding.lower() == "chunked":
@@ -358,18 +414,13 @@ class Respondent(httping.Parsent):
                 if encoding:
                     self.encoding = encoding
 
-            if 'text/event-stream' in contentType.lower():
-                self.evented = True
+            contentType = contentType.lower()  # fold case once for both checks
+            self.evented = 'text/event-stream' in contentType
+            if self.evented:
                 self.eventSource = httping.EventSource(raw=self.body,
                                                        events=self.events,
                                                        dictable=self.dictable)
-            else:
-                self.evented = False
-
-            if 'application/json' in contentType.lower():
-                self.jsoned = True
-            else:
-                self.jsoned = False
+            self.jsoned = 'application/json' in contentType
 
         self.checkPersisted()
 
@@ -444,7 +495,7 @@ class Respondent(httping.Parsent):
         else:
             while True:
                 if self.msg:
-                    self.body.extend(self.msg[:])
+                    self.body.extend(self.msg)  # no interim slice copy
                     del self.msg[:]
 
                 if self.evented:
@@ -2,15 +2,18 @@
 Package verification tests for PyScript/Pyodide environment.
 Each test exercises a basic function from the imported package.
 """
-import datetime
+import asyncio
+
 from pyscript import document
 
+from ui_log import log, clear_output
 
-def log(msg: str, css_class: str = "info"):
-    """Append a message to the output div."""
-    output = document.querySelector("#output")
-    time = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3]
-    output.innerHTML += f'<span class="{css_class}">[{time}] {msg}</span>\n'
+# Resolved once for the hash button, the checks below import their own
+# package so a missing one is reported as that check's failure
+try:
+    import blake3
+except ImportError:
+    blake3 = None
 
 
 def result(name: str, passed: bool, detail: str = ""):
@@ -22,246 +25,166 @@ def result(name: str, passed: bool, detail: str = ""):
     return passed
 
 
+def _check_blake3():
+    import blake3
+    h = blake3.blake3(b"test").hexdigest()
+    return len(h) == 64, f"hash={h[:16]}..."
+
+
+def _check_jsonschema():
+    import jsonschema
+    schema = {"type": "string"}
+    jsonschema.validate("hello", schema)
+    return True, "validate() worked"
+
+
+def _check_msgpack():
+    import msgpack
+    data = {"key": "value", "num": 42}
+    packed = msgpack.packb(data)
+    unpacked = msgpack.unpackb(packed)
+    return unpacked == data, "pack/unpack roundtrip"
+
+
+def _check_multidict():
+    from multidict import MultiDict
+    md = MultiDict([("a", 1), ("a", 2)])
+    return md.getall("a") == [1, 2], "MultiDict works"
+
+
+def _check_pyyaml():
+    import yaml
+    data = yaml.safe_load("key: value\nnum: 42")
+    return data == {"key": "value", "num": 42}, "safe_load works"
+
+
+def _check_cryptography():
+    from cryptography.fernet import Fernet
+    key = Fernet.generate_key()
+    f = Fernet(key)
+    msg = b"secret"
+    decrypted = f.decrypt(f.encrypt(msg))
+    return decrypted == msg, "Fernet encrypt/decrypt"
+
+
+def _check_multicommand():
+    import multicommand
+    return hasattr(multicommand, "create_parser"), "module loaded"
+
+
+def _check_hjson():
+    import hjson
+    data = hjson.loads('key: value\nnum: 42')
+    return data["key"] == "value", "parse hjson"
+
+
+def _check_apispec():
+    from apispec import APISpec
+    spec = APISpec(title="Test", version="1.0.0", openapi_version="3.0.0")
+    return spec.to_dict()["info"]["title"] == "Test", "APISpec created"
+
+
+def _check_mnemonic():
+    from mnemonic import Mnemonic
+    m = Mnemonic("english")
+    words = m.generate(128)
+    return len(words.split()) == 12, "12-word phrase generated"
+
+
+def _check_prettytable():
+    from prettytable import PrettyTable
+    t = PrettyTable(["Name", "Age"])
+    t.add_row(["Alice", 30])
+    output = t.get_string()
+    return "Alice" in output, "table rendered"
+
+
+def _check_http_sfv():
+    import http_sfv
+    item = http_sfv.Item()
+    item.parse(b"42")
+    return item.value == 42, "parse integer"
+
+
+def _check_semver():
+    import semver
+    v = semver.Version.parse("1.2.3")
+    return v.major == 1 and v.minor == 2, "parse version"
+
+
+def _check_qrcode():
+    import qrcode
+    qr = qrcode.QRCode(version=1)
+    qr.add_data("test")
+    qr.make(fit=True)
+    return qr.data_list is not None, "QR code created"
+
+
+def _check_ordered_set():
+    from ordered_set import OrderedSet
+    s = OrderedSet([3, 1, 2, 1])
+    return list(s) == [3, 1, 2], "preserves order, dedupes"
+
+
+def _check_cbor2():
+    import cbor2
+    data = {"key": "value", "num": 42}
+    encoded = cbor2.dumps(data)
+    decoded = cbor2.loads(encoded)
+    return decoded == data, "encode/decode roundtrip"
+
+
+def _check_setuptools():
+    import setuptools
+    return hasattr(setuptools, "setup"), "module loaded"
+
+
+def _check_wheel():
+    import wheel
+    return hasattr(wheel, "__version__"), f"v{wheel.__version__}"
+
+
+# (name, check) in run order, each check imports its package and
+# returns (passed, detail), any exception counts as a failure
+PACKAGE_CHECKS = [
+    ("blake3", _check_blake3),
+    ("jsonschema", _check_jsonschema),
+    ("msgpack", _check_msgpack),
+    ("multidict", _check_multidict),
+    ("pyyaml", _check_pyyaml),
+    ("cryptography", _check_cryptography),
+    ("multicommand", _check_multicommand),
+    ("hjson", _check_hjson),
+    ("apispec", _check_apispec),
+    ("mnemonic", _check_mnemonic),
+    ("prettytable", _check_prettytable),
+    ("http-sfv", _check_http_sfv),
+    ("semver", _check_semver),
+    ("qrcode", _check_qrcode),
+    ("ordered-set", _check_ordered_set),
+    ("cbor2", _check_cbor2),
+    ("setuptools", _check_setuptools),
+    ("wheel", _check_wheel),
+]
+
+
 def run_all_tests():
     """Run all package tests and return (passed, failed) counts."""
     passed = 0
     failed = 0
 
-    # --- blake3 ---
-    try:
-        import blake3
-        h = blake3.blake3(b"test").hexdigest()
-        if result("blake3", len(h) == 64, f"hash={h[:16]}..."):
-            passed += 1
-        else:
-            failed += 1
-    except Exception as e:
-        result("blake3", False, str(e))
-        failed += 1
-
-    # --- jsonschema ---
-    try:
-        import jsonschema
-        schema = {"type": "string"}
-        jsonschema.validate("hello", schema)
-        if result("jsonschema", True, "validate() worked"):
-            passed += 1
-        else:
-            failed += 1
-    except Exception as e:
-        result("jsonschema", False, str(e))
-        failed += 1
-
-    # --- msgpack ---
-    try:
-        import msgpack
-        data = {"key": "value", "num": 42}
-        packed = msgpack.packb(data)
-        unpacked = msgpack.unpackb(packed)
-        if result("msgpack", unpacked == data, "pack/unpack roundtrip"):
-            passed += 1
-        else:
-            failed += 1
-    except Exception as e:
-        result("msgpack", False, str(e))
-        failed += 1
-
-    # --- multidict ---
-    try:
-        from multidict import MultiDict
-        md = MultiDict([("a", 1), ("a", 2)])
-        if result("multidict", md.getall("a") == [1, 2], "MultiDict works"):
-            passed += 1
-        else:
-            failed += 1
-    except Exception as e:
-        result("multidict", False, str(e))
-        failed += 1
-
-    # --- pyyaml ---
-    try:
-        import yaml
-        data = yaml.safe_load("key: value\nnum: 42")
-        if result("pyyaml", data == {"key": "value", "num": 42}, "safe_load works"):
-            passed += 1
-        else:
-            failed += 1
-    except Exception as e:
-        result("pyyaml", False, str(e))
-        failed += 1
-
-    # --- cryptography (Fernet) ---
-    try:
-        from cryptography.fernet import Fernet
-        key = Fernet.generate_key()
-        f = Fernet(key)
-        msg = b"secret"
-        decrypted = f.decrypt(f.encrypt(msg))
-        if result("cryptography", decrypted == msg, "Fernet encrypt/decrypt"):
-            passed += 1
-        else:
-            failed += 1
-    except Exception as e:
-        result("cryptography", False, str(e))
-        failed += 1
-
-    # --- multicommand ---
-    try:
-        import multicommand
-        if result("multicommand", hasattr(multicommand, "create_parser"), "module loaded"):
-            passed += 1
-        else:
-            failed += 1
-    except Exception as e:
-        result("multicommand", False, str(e))
-        failed += 1
-
-    # --- hjson ---
-    try:
-        import hjson
-        data = hjson.loads('key: value\nnum: 42')
-        if result("hjson", data["key"] == "value", "parse hjson"):
-            passed += 1
-        else:
-            failed += 1
-    except Exception as e:
-        result("hjson", False, str(e))
-        failed += 1
-
-    # --- apispec ---
-    try:
-        from apispec import APISpec
-        spec = APISpec(title="Test", version="1.0.0", openapi_version="3.0.0")
-        if result("apispec", spec.to_dict()["info"]["title"] == "Test", "APISpec created"):
-            passed += 1
-        else:
-            failed += 1
-    except Exception as e:
-        result("apispec", False, str(e))
-        failed += 1
-
-    # --- mnemonic ---
-    try:
-        from mnemonic import Mnemonic
-        m = Mnemonic("english")
-        words = m.generate(128)
-        if result("mnemonic", len(words.split()) == 12, "12-word phrase generated"):
-            passed += 1
-        else:
-            failed += 1
-    except Exception as e:
-        result("mnemonic", False, str(e))
-        failed += 1
-
-    # --- prettytable ---
-    try:
-        from prettytable import PrettyTable
-        t = PrettyTable(["Name", "Age"])
-        t.add_row(["Alice", 30])
-        output = t.get_string()
-        if result("prettytable", "Alice" in output, "table rendered"):
-            passed += 1
-        else:
-            failed += 1
-    except Exception as e:
-        result("prettytable", False, str(e))
-        failed += 1
-
-    # --- http-sfv ---
-    try:
-        import http_sfv
-        item = http_sfv.Item()
-        item.parse(b"42")
-        if result("http-sfv", item.value == 42, "parse integer"):
-            passed += 1
-        else:
-            failed += 1
-    except Exception as e:
-        result("http-sfv", False, str(e))
-        failed += 1
-
-    # --- semver ---
-    try:
-        import semver
-        v = semver.Version.parse("1.2.3")
-        if result("semver", v.major == 1 and v.minor == 2, "parse version"):
-            passed += 1
-        else:
-            failed += 1
-    except Exception as e:
-        result("semver", False, str(e))
-        failed += 1
-
-    # --- qrcode ---
-    try:
-        import qrcode
-        qr = qrcode.QRCode(version=1)
-        qr.add_data("test")
-        qr.make(fit=True)
-        if result("qrcode", qr.data_list is not None, "QR code created"):
-            passed += 1
-        else:
-            failed += 1
-    except Exception as e:
-        result("qrcode", False, str(e))
-        failed += 1
-
-    # --- ordered-set ---
-    try:
-        from ordered_set import OrderedSet
-        s = OrderedSet([3, 1, 2, 1])
-        if result("ordered-set", list(s) == [3, 1, 2], "preserves order, dedupes"):
-            passed += 1
-        else:
-            failed += 1
-    except Exception as e:
-        result("ordered-set", False, str(e))
-        failed += 1
-
-    # --- cbor2 ---
-    try:
-        import cbor2
-        data = {"key": "value", "num": 42}
-        encoded = cbor2.dumps(data)
-        decoded = cbor2.loads(encoded)
-        if result("cbor2", decoded == data, "encode/decode roundtrip"):
-            passed += 1
-        else:
-            failed += 1
-    except Exception as e:
-        result("cbor2", False, str(e))
-        failed += 1
-
-    # --- setuptools ---
-    try:
-        import setuptools
-        if result("setuptools", hasattr(setuptools, "setup"), "module loaded"):
-            passed += 1
-        else:
-            failed += 1
-    except Exception as e:
-        result("setuptools", False, str(e))
-        failed += 1
-
-    # --- wheel ---
-    try:
-        import wheel
-        if result("wheel", hasattr(wheel, "__version__"), f"v{wheel.__version__}"):
-            passed += 1
-        else:
-            failed += 1
-    except Exception as e:
-        result("wheel", False, str(e))
-        failed += 1
+    for name, check in PACKAGE_CHECKS:
+        try:
+            ok, detail = check()
+        except Exception as e:
+            ok, detail = False, str(e)
+        ok = result(name, bool(ok), detail)
+        passed += ok
+        failed += not ok
 
     return passed, failed
 
 
-def clear_output():
-    """Clear the output div."""
-    document.querySelector("#output").innerHTML = ""
-
-
 def run_tests(event):
     """Run all package tests (button handler)."""
     clear_output()
@@ -275,19 +198,39 @@ def run_tests(event):
     log(f"SUMMARY: {passed} passed, {failed} failed", summary_class)
 
 
-def hash_input(event):
-    """Hash the input text using blake3 (button handler)."""
-    import blake3
+HASH_CHUNK = 64 * 1024  # characters encoded and hashed per step
+
+_hash_task = None  # the in-flight hash, a click while it is pending is ignored
+
+
+async def _hash_input_async():
+    """Hash the input text in chunks, yielding to the page between them."""
     clear_output()
+    if blake3 is None:
+        log("blake3 is not available", "fail")
+        return
     text = document.querySelector("#input").value
     log(f'Input: "{text}"')
-    
-    h = blake3.blake3(text.encode('utf-8'))
+
+    h = blake3.blake3()
+    for i in range(0, len(text), HASH_CHUNK):
+        h.update(text[i:i + HASH_CHUNK].encode('utf-8'))
+        await asyncio.sleep(0)
     hex_digest = h.hexdigest()
-    
+
     log(f"Blake3: {hex_digest}", "success")
 
 
+def hash_input(event):
+    """Hash the input text using blake3 (button handler)."""
+    global _hash_task
+    if _hash_task is not None and not _hash_task.done():
+        log("blake3 hash is already running", "info")
+        return _hash_task
+    _hash_task = asyncio.ensure_future(_hash_input_async())
+    return _hash_task
+
+
 # Initialize on load
 clear_output()
 log("PyScript loaded! All packages ready.", "success")
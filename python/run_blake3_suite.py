@@ -11,37 +11,12 @@ Architecture:
 """
 
 import asyncio
-import datetime
 
-# Try to import pyscript document
-try:
-    from pyscript import document
-except ImportError:
-    document = None
+from ui_log import log, log_exc, clear_output
 
-
-def log(msg: str, css_class: str = "info"):
-    """Append a message to the output div."""
-    if document is None:
-        print(msg)
-        return
-    output = document.querySelector("#output")
-    if output is None:
-        print(msg)
-        return
-    time = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3]
-    msg = str(msg).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-    output.innerHTML += f'<span class="{css_class}">[{time}] {msg}</span>\n'
-    output.scrollTop = output.scrollHeight
-
-
-def clear_output():
-    """Clear the output div."""
-    if document is None:
-        return
-    output = document.querySelector("#output")
-    if output:
-        output.innerHTML = ""
+# Scheduler shared by every click, created on the first run
+_web_doist = None
+_task = None  # the in-flight run, a click while it is pending is ignored
 
 
 async def _run_blake3_suite_async():
@@ -53,6 +28,7 @@ async def _run_blake3_suite_async():
     2. Injects them into TestRunnerDoer (execution)
     3. Runs via WebDoist for cooperative scheduling
     """
+    global _web_doist
     clear_output()
     log("Initializing hio-based blake3 test runner...")
     log("")
@@ -65,8 +41,7 @@ async def _run_blake3_suite_async():
         log("Loaded hio and test components", "success")
     except Exception as e:
         log(f"FAILED to load components: {e}", "fail")
-        import traceback
-        log(traceback.format_exc(), "fail")
+        log_exc()
         return
     
     # Show blake3 info before loading tests
@@ -76,8 +51,7 @@ async def _run_blake3_suite_async():
         log("")
     except Exception as e:
         log(f"FAILED to import blake3: {e}", "fail")
-        import traceback
-        log(traceback.format_exc(), "fail")
+        log_exc()
         return
     
     # Load tests (configuration phase)
@@ -93,20 +67,20 @@ async def _run_blake3_suite_async():
         tock=0.0  # tock=0 means ready to run immediately
     )
     
-    # Create WebDoist scheduler
+    # Create WebDoist scheduler once, later runs just swap in their doer
     # tock=0.01 means 10ms between cycles (100 updates/sec max)
     # real=True means honor timing (vs run as fast as possible)
-    web_doist = WebDoist(doers=[test_doer], tock=0.01, real=True, limit=600.0)
+    if _web_doist is None:
+        _web_doist = WebDoist(tock=0.01, real=True, limit=600.0)
     
     log("Starting test execution with hio scheduler...")
     log("")
     
     try:
-        await web_doist.do()
+        await _web_doist.do(doers=[test_doer])
     except Exception as e:
         log(f"Test execution failed: {e}", "fail")
-        import traceback
-        log(traceback.format_exc(), "fail")
+        log_exc()
     
     log("")
     log("Test run complete.", "info")
@@ -119,4 +93,9 @@ def run_blake3_suite(event):
     This function is called synchronously by PyScript when the button
     is clicked. It schedules the async test runner to execute.
     """
-    asyncio.ensure_future(_run_blake3_suite_async())
+    global _task
+    if _task is not None and not _task.done():
+        log("blake3 tests are already running", "info")
+        return _task
+    _task = asyncio.ensure_future(_run_blake3_suite_async())
+    return _task
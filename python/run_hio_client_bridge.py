@@ -6,35 +6,23 @@ reconstruct a raw HTTP response, and parse it with hio's Respondent.
 """
 
 import asyncio
-import datetime
 
 import js  # type: ignore
-from pyscript import document, fetch
+from pyscript import fetch
 
-from hio_http_client_bridge import Requester, Respondent
+from ui_log import log, clear_output
 
-
-def log(msg: str, css_class: str = "info") -> None:
-    output = document.querySelector("#output")
-    if output is None:
-        print(msg)
-        return
-    time = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3]
-    msg = str(msg).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-    output.innerHTML += f'<span class="{css_class}">[{time}] {msg}</span>\n'
-    output.scrollTop = output.scrollHeight
-
-
-def clear_output() -> None:
-    output = document.querySelector("#output")
-    if output:
-        output.innerHTML = ""
+# framing headers fetch has already undone, the body is read to close instead
+_SKIP_HEADERS = frozenset(("transfer-encoding", "content-length"))
 
 
 async def _run_hio_client_bridge_async() -> None:
     clear_output()
     log("Starting hio HTTP client JS-bridge prototype...")
 
+    # hio's HTTP parser is only needed once the button is clicked
+    from hio_http_client_bridge import Requester, Respondent
+
     location = js.window.location
     origin = location.origin
     url = f"{origin}/index.html"
@@ -48,9 +36,10 @@ async def _run_hio_client_bridge_async() -> None:
     requester = Requester(method="GET", path="/index.html", hostname=hostname, port=int(port), scheme=scheme)
     request_bytes = requester.rebuild()
     log("Built request via hio Requester:")
-    for line in requester.lines[:5]:
+    lines = requester.head.split(b"\r\n")
+    for line in lines[:5]:
         log(f"  {line.decode('iso-8859-1')}")
-    if len(requester.lines) > 5:
+    if len(lines) > 5:
         log("  ...")
 
     # Execute via JS fetch (no raw sockets in WASM)
@@ -63,31 +52,30 @@ async def _run_hio_client_bridge_async() -> None:
     status = int(resp.status)
     status_text = resp.statusText or "OK"
 
-    buf = await resp.arrayBuffer()
-    body = bytes(js.Uint8Array.new(buf).to_py())
-
-    # Collect headers and normalize for parsing
-    header_items = []
-    for entry in resp.headers.entries():
-        name = str(entry[0])
-        value = str(entry[1])
-        header_items.append((name, value))
-
-    header_lines = []
-    for name, value in header_items:
-        lname = name.lower()
-        if lname in ("transfer-encoding", "content-length"):
+    # Synthesize the head only, fetch has already undone the framing so
+    # Respondent reads the body until close as the stream delivers it
+    raw = bytearray(f"HTTP/1.1 {status} {status_text}\r\n", "iso-8859-1")
+    for name, value in resp.headers.entries():
+        if name.lower() in _SKIP_HEADERS:
             continue
-        header_lines.append(f"{name}: {value}\r\n")
-    header_lines.append(f"Content-Length: {len(body)}\r\n")
-
-    raw_head = f"HTTP/1.1 {status} {status_text}\r\n" + "".join(header_lines) + "\r\n"
-    raw = raw_head.encode("iso-8859-1") + body
-
-    # Parse with hio Respondent
-    respondent = Respondent(msg=bytearray(raw), method=requester.method)
-    while respondent.parser:
-        respondent.parse()
+        raw += f"{name}: {value}\r\n".encode("iso-8859-1")
+    raw += b"\r\n"
+
+    # Parse with hio Respondent, one chunk at a time
+    respondent = Respondent(msg=raw, method=requester.method)
+    if resp.body is not None:
+        reader = resp.body.getReader()
+        while True:
+            chunk = await reader.read()
+            if chunk.done:
+                break
+            respondent.msg += chunk.value.to_bytes()
+            respondent.parse()
+    respondent.close()
+    respondent.parse()
+    if respondent.parser:
+        log("Respondent did not finish parsing the streamed response", "fail")
+        return
     respondent.dictify()
 
     log("")
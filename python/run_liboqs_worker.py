@@ -5,11 +5,17 @@ Runs the liboqs suite inside a Pyodide web worker and streams
 batched log entries back to the main thread via postMessage.
 """
 
-import datetime
 import json
+import traceback
 
 import js  # type: ignore
 
+from ui_log import timestamp
+
+LOG_BATCH_MAX = 64  # entries per enqueueLiboqsLogJson call, also sent each recur
+
+_log_batch = []  # entries not yet handed to the JS log queue
+
 
 def _escape(msg: str) -> str:
     return (
@@ -20,18 +26,42 @@ def _escape(msg: str) -> str:
     )
 
 
+def _send_logs() -> None:
+    """Hand batched entries to the JS log queue as one JSON array."""
+    if _log_batch:
+        js.enqueueLiboqsLogJson(json.dumps(_log_batch))
+        _log_batch.clear()
+
+
+def flush_logs() -> None:
+    """Send any batched entries and post the JS log queue right away."""
+    _send_logs()
+    js.flushLiboqsLogs()
+
+
 def log(msg: str, css_class: str = "info") -> None:
-    time = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3]
-    payload = json.dumps({
-        "time": time,
+    stamp = timestamp()
+    _log_batch.append({
+        "time": stamp,
         "msg": _escape(msg),
         "css": css_class,
     })
-    js.enqueueLiboqsLogJson(payload)
+    if len(_log_batch) >= LOG_BATCH_MAX:
+        _send_logs()
+
+
+def _log_exc() -> None:
+    """Log the traceback of the exception being handled."""
+    log(traceback.format_exc(), "fail")
+
+
+# Scheduler shared by every run in this worker, created on the first run
+_web_doist = None
 
 
 async def run() -> None:
     """Run the liboqs test suite with hio scheduling in the worker."""
+    global _web_doist
     log("Initializing hio-based liboqs test runner...")
     log("")
 
@@ -46,9 +76,8 @@ async def run() -> None:
         log("Loaded hio and test components", "success")
     except Exception as exc:
         log(f"FAILED to load components: {exc}", "fail")
-        import traceback
-        log(traceback.format_exc(), "fail")
-        js.flushLiboqsLogs()
+        _log_exc()
+        flush_logs()
         return
 
     try:
@@ -59,9 +88,8 @@ async def run() -> None:
         log("")
     except Exception as exc:
         log(f"FAILED to import oqs: {exc}", "fail")
-        import traceback
-        log(traceback.format_exc(), "fail")
-        js.flushLiboqsLogs()
+        _log_exc()
+        flush_logs()
         return
 
     log("Loading tests from test modules...")
@@ -72,21 +100,22 @@ async def run() -> None:
     test_doer = TestRunnerDoer(
         test_queue=test_queue,
         title="LIBOQS-PYTHON FULL TEST SUITE (hio scheduler)",
+        on_yield=_send_logs,  # hand each test's lines to JS before the scheduler yields
         tock=0.0,
     )
 
-    web_doist = WebDoist(doers=[test_doer], tock=0.01, real=True, limit=600.0)
+    if _web_doist is None:
+        _web_doist = WebDoist(tock=0.01, real=True, limit=600.0)
 
     log("Starting test execution with hio scheduler...")
     log("")
 
     try:
-        await web_doist.do()
+        await _web_doist.do(doers=[test_doer])
     except Exception as exc:
         log(f"Test execution failed: {exc}", "fail")
-        import traceback
-        log(traceback.format_exc(), "fail")
+        _log_exc()
 
     log("")
     log("Test run complete.", "info")
-    js.flushLiboqsLogs()
+    flush_logs()
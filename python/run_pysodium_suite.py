@@ -6,25 +6,15 @@ via PyScript, capturing output and displaying it in the page.
 """
 
 import asyncio
-import datetime
-import io
 import sys
 import unittest
 
-import js  # type: ignore
-from pyscript import document
+from ui_log import log, log_exc, clear_output
 
+# TestPySodium method names, scanned once and reused on later runs
+_test_names = None
 
-def log(msg: str, css_class: str = "info"):
-    """Append a message to the output div."""
-    output = document.querySelector("#output")
-    time = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3]
-    output.innerHTML += f'<span class="{css_class}">[{time}] {msg}</span>\n'
-
-
-def clear_output():
-    """Clear the output div."""
-    document.querySelector("#output").innerHTML = ""
+_task = None  # the in-flight run, a click while it is pending is ignored
 
 
 class BrowserTestResult(unittest.TestResult):
@@ -32,15 +22,11 @@ class BrowserTestResult(unittest.TestResult):
 
     def __init__(self):
         super().__init__()
-        self.successes = []
-
-    def startTest(self, test):
-        super().startTest(test)
-        log(f"Running: {test}", "info")
+        self.success_count = 0  # count only, no need to keep the test objects
 
     def addSuccess(self, test):
         super().addSuccess(test)
-        self.successes.append(test)
+        self.success_count += 1
         log(f"  PASS: {test}", "success")
 
     def addError(self, test, err):
@@ -58,8 +44,8 @@ class BrowserTestResult(unittest.TestResult):
         log(f"  SKIP: {test} - {reason}", "info")
 
 
-def _run_full_suite():
-    """Run the full pysodium unittest suite."""
+async def _run_full_suite():
+    """Run the full pysodium unittest suite, yielding to the page between tests."""
     log("================================================================")
     log("Starting Full Pysodium unittest Suite")
     log("================================================================")
@@ -72,23 +58,30 @@ def _run_full_suite():
         log(f"FAIL: Could not import pysodium_unittest: {exc}", "fail")
         raise
 
-    # Load all tests from the TestPySodium class
-    loader = unittest.TestLoader()
-    suite = loader.loadTestsFromTestCase(TestPySodium)
+    # Load all tests from the TestPySodium class, only the scanned names
+    # are kept across runs
+    global _test_names
+    if _test_names is None:
+        _test_names = unittest.TestLoader().getTestCaseNames(TestPySodium)
 
-    log(f"Found {suite.countTestCases()} tests to run")
+    log(f"Found {len(_test_names)} tests to run")
     log("----------------------------------------------------------------")
 
-    # Run with our custom result handler
+    # Run with our custom result handler, one test per event loop turn so
+    # the page can render the log and handle input while the suite runs.
+    # TestPySodium has no class or module fixtures, so running the cases
+    # directly matches what a TestSuite would do.
     result = BrowserTestResult()
-    suite.run(result)
+    for name in _test_names:
+        TestPySodium(name).run(result)
+        await asyncio.sleep(0)
 
     # Summary
     log("================================================================")
     log("TEST SUMMARY")
     log("================================================================")
     log(f"Tests run:    {result.testsRun}")
-    log(f"Passed:       {len(result.successes)}", "success" if result.successes else "info")
+    log(f"Passed:       {result.success_count}", "success" if result.success_count else "info")
     log(f"Failures:     {len(result.failures)}", "fail" if result.failures else "info")
     log(f"Errors:       {len(result.errors)}", "fail" if result.errors else "info")
     log(f"Skipped:      {len(result.skipped)}", "info")
@@ -113,8 +106,8 @@ def _run_full_suite():
         log("SOME TESTS FAILED - see details above", "fail")
 
 
-def run_full_suite(event):
-    """Async wrapper for running the test suite."""
+async def _run_full_suite_async():
+    """Run the test suite, logging any exception it raises."""
     clear_output()
     log("Initializing full pysodium test suite...", "info")
 
@@ -123,12 +116,21 @@ def run_full_suite(event):
     stderr = sys.stderr
 
     try:
-        _run_full_suite()
+        await _run_full_suite()
     except Exception as exc:
         log(f"Test suite failed with exception: {exc}", "fail")
-        import traceback
-        log(traceback.format_exc(), "fail")
+        log_exc()
     finally:
         sys.stdout = stdout
         sys.stderr = stderr
 
+
+def run_full_suite(event):
+    """Button click handler - starts the suite without blocking the page."""
+    global _task
+    if _task is not None and not _task.done():
+        log("pysodium tests are already running", "info")
+        return _task
+    _task = asyncio.ensure_future(_run_full_suite_async())
+    return _task
+
@@ -12,6 +12,19 @@ from typing import List, Tuple, Any, Callable, Optional
 TestEntry = Tuple[str, Optional[Callable[..., Any]], Tuple[Any, ...]]
 
 
+def _expand(tests: List[TestEntry], ns: str, gen) -> None:
+    """
+    Append the (func, *args) tuples yielded by a generator test as entries.
+    
+    Items that are not tuples of at least (func, arg) are skipped.
+    """
+    append = tests.append
+    for item in gen:
+        if isinstance(item, tuple) and len(item) >= 2:
+            func = item[0]
+            append((f"{ns}.{func.__name__}", func, item[1:]))
+
+
 def load_kem_tests() -> List[TestEntry]:
     """
     Load KEM tests from test_kem module.
@@ -28,20 +41,12 @@ def load_kem_tests() -> List[TestEntry]:
         tests.append(("=== KEM TESTS ===", None, ()))
         
         # Generator tests - expand them
-        for item in test_kem.test_correctness():
-            if isinstance(item, tuple) and len(item) >= 2:
-                func, *args = item
-                tests.append((f"kem.{func.__name__}", func, tuple(args)))
-        
-        for item in test_kem.test_seed_generation():
-            if isinstance(item, tuple) and len(item) >= 2:
-                func, *args = item
-                tests.append((f"kem.{func.__name__}", func, tuple(args)))
-        
-        for item in test_kem.test_wrong_ciphertext():
-            if isinstance(item, tuple) and len(item) >= 2:
-                func, *args = item
-                tests.append((f"kem.{func.__name__}", func, tuple(args)))
+        for gen in (
+            test_kem.test_correctness,
+            test_kem.test_seed_generation,
+            test_kem.test_wrong_ciphertext,
+        ):
+            _expand(tests, "kem", gen())
         
         # Simple tests
         tests.append(("kem.test_not_supported", test_kem.test_not_supported, ()))
@@ -69,30 +74,14 @@ def load_sig_tests() -> List[TestEntry]:
         
         tests.append(("=== SIGNATURE TESTS ===", None, ()))
         
-        for item in test_sig.test_correctness():
-            if isinstance(item, tuple) and len(item) >= 2:
-                func, *args = item
-                tests.append((f"sig.{func.__name__}", func, tuple(args)))
-        
-        for item in test_sig.test_correctness_with_ctx_str():
-            if isinstance(item, tuple) and len(item) >= 2:
-                func, *args = item
-                tests.append((f"sig.{func.__name__}", func, tuple(args)))
-        
-        for item in test_sig.test_wrong_message():
-            if isinstance(item, tuple) and len(item) >= 2:
-                func, *args = item
-                tests.append((f"sig.{func.__name__}", func, tuple(args)))
-        
-        for item in test_sig.test_wrong_signature():
-            if isinstance(item, tuple) and len(item) >= 2:
-                func, *args = item
-                tests.append((f"sig.{func.__name__}", func, tuple(args)))
-        
-        for item in test_sig.test_wrong_public_key():
-            if isinstance(item, tuple) and len(item) >= 2:
-                func, *args = item
-                tests.append((f"sig.{func.__name__}", func, tuple(args)))
+        for gen in (
+            test_sig.test_correctness,
+            test_sig.test_correctness_with_ctx_str,
+            test_sig.test_wrong_message,
+            test_sig.test_wrong_signature,
+            test_sig.test_wrong_public_key,
+        ):
+            _expand(tests, "sig", gen())
         
         tests.append(("sig.test_sig_with_ctx_support_detection", test_sig.test_sig_with_ctx_support_detection, ()))
         tests.append(("sig.test_not_supported", test_sig.test_not_supported, ()))
@@ -119,25 +108,13 @@ def load_stfl_sig_tests() -> List[TestEntry]:
         
         tests.append(("=== STATEFUL SIGNATURE TESTS ===", None, ()))
         
-        for item in test_stfl_sig.test_correctness():
-            if isinstance(item, tuple) and len(item) >= 2:
-                func, *args = item
-                tests.append((f"stfl.{func.__name__}", func, tuple(args)))
-        
-        for item in test_stfl_sig.test_wrong_message():
-            if isinstance(item, tuple) and len(item) >= 2:
-                func, *args = item
-                tests.append((f"stfl.{func.__name__}", func, tuple(args)))
-        
-        for item in test_stfl_sig.test_wrong_signature():
-            if isinstance(item, tuple) and len(item) >= 2:
-                func, *args = item
-                tests.append((f"stfl.{func.__name__}", func, tuple(args)))
-        
-        for item in test_stfl_sig.test_wrong_public_key():
-            if isinstance(item, tuple) and len(item) >= 2:
-                func, *args = item
-                tests.append((f"stfl.{func.__name__}", func, tuple(args)))
+        for gen in (
+            test_stfl_sig.test_correctness,
+            test_stfl_sig.test_wrong_message,
+            test_stfl_sig.test_wrong_signature,
+            test_stfl_sig.test_wrong_public_key,
+        ):
+            _expand(tests, "stfl", gen())
         
         tests.append(("stfl.test_not_supported", test_stfl_sig.test_not_supported, ()))
         tests.append(("stfl.test_not_enabled", test_stfl_sig.test_not_enabled, ()))
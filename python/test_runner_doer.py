@@ -6,32 +6,11 @@ yielding between tests to keep the browser responsive. Tests are injected
 via constructor, following hio conventions.
 """
 
-import datetime
 from typing import Callable, List, Tuple, Any, Optional
 
 from hio.base.doing import Doer
 
-# Try to import pyscript document, fall back to None for testing
-try:
-    from pyscript import document
-except ImportError:
-    document = None
-
-
-def log(msg: str, css_class: str = "info"):
-    """Append a message to the output div."""
-    if document is None:
-        print(msg)
-        return
-    output = document.querySelector("#output")
-    if output is None:
-        print(msg)
-        return
-    time = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3]
-    # Escape HTML entities
-    msg = str(msg).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-    output.innerHTML += f'<span class="{css_class}">[{time}] {msg}</span>\n'
-    output.scrollTop = output.scrollHeight
+from ui_log import log
 
 
 class TestResults:
@@ -109,12 +88,16 @@ class TestRunnerDoer(Doer):
         test_queue: List of (name, func, args) tuples. When func is None,
             the entry is treated as a section header.
         title: Optional title to display at start of test run.
+        on_yield: Optional callable run at the end of every recur(), just
+            before control goes back to the scheduler.
     """
     
-    def __init__(self, test_queue: List[TestEntry], title: str = "Test Suite", **kwa):
+    def __init__(self, test_queue: List[TestEntry], title: str = "Test Suite",
+                 on_yield: Optional[Callable[[], None]] = None, **kwa):
         super().__init__(**kwa)
         self.test_queue = test_queue
         self.title = title
+        self.on_yield = on_yield
         self.results = TestResults()
         self.current_index = 0
     
@@ -135,6 +118,14 @@ class TestRunnerDoer(Doer):
             True if done (all tests complete)
             False if more tests remain
         """
+        try:
+            return self._run_next()
+        finally:
+            if self.on_yield is not None:
+                self.on_yield()
+    
+    def _run_next(self):
+        """Run the next queue entry, returning True once the queue is done."""
         if self.current_index >= len(self.test_queue):
             # All tests complete - print summary
             log("")
@@ -0,0 +1,139 @@
+"""
+ui_log.py - Shared page logger for the browser test runners.
+
+Log lines are queued and appended to the #output div once per animation
+frame, so a chatty suite costs one DOM append per frame instead of an
+innerHTML reparse and reflow per line. Lines become <span> nodes whose
+text is set through textContent, so nothing is HTML parsed or escaped.
+
+Lines below LOG_LEVEL are dropped before any work is done. The level
+defaults to INFO and can be set with a ?log=debug (or numeric) page param,
+which also turns on the tracebacks log_exc() writes after a failure line.
+"""
+
+import time
+import traceback
+
+# Try to import pyscript/pyodide, fall back to print for workers and testing
+try:
+    import js  # type: ignore
+    from pyodide.ffi import create_proxy
+    from pyscript import document
+except ImportError:
+    js = None
+    create_proxy = None
+    document = None
+
+
+DEBUG = 10
+INFO = 20
+
+_LEVEL_NAMES = {"debug": DEBUG, "info": INFO}
+
+
+def _level_from_url() -> int:
+    """Return the level named by the page's ?log= param, INFO if unset."""
+    if document is None:
+        return INFO
+    value = js.URLSearchParams.new(js.window.location.search).get("log")
+    if not value:
+        return INFO
+    value = str(value).lower()
+    if value in _LEVEL_NAMES:
+        return _LEVEL_NAMES[value]
+    try:
+        return int(value)
+    except ValueError:
+        return INFO
+
+
+LOG_LEVEL = _level_from_url()
+
+_output = None  # cached #output node, the div is fixed for the page lifetime
+_pending = []  # (css_class, text) lines waiting for the next frame
+_span = None  # bare <span> cloned for each line instead of createElement
+_flush_proxy = None  # requestAnimationFrame callback, created once and reused
+_flush_scheduled = False
+
+_last_ms = -1  # millisecond of the last stamp, bursts reuse it
+_last_stamp = ""
+
+
+def timestamp() -> str:
+    """Return the local time as HH:MM:SS.mmm for log stamps."""
+    global _last_ms, _last_stamp
+    t = time.time()
+    ms = int(t * 1000)
+    if ms != _last_ms:
+        lt = time.localtime(t)
+        _last_stamp = f"{lt.tm_hour:02d}:{lt.tm_min:02d}:{lt.tm_sec:02d}.{ms % 1000:03d}"
+        _last_ms = ms
+    return _last_stamp
+
+
+def _get_output():
+    """Return the #output div, looking it up only until it is found."""
+    global _output
+    if _output is None:
+        _output = document.querySelector("#output")
+    return _output
+
+
+def _flush(*_args) -> None:
+    """Append all pending lines to the output div in one DOM write."""
+    global _flush_scheduled, _span
+    _flush_scheduled = False
+    if not _pending:
+        return
+    output = _get_output()
+    if output is None:
+        for _css_class, text in _pending:
+            print(text, end="")
+        _pending.clear()
+        return
+    if _span is None:
+        _span = document.createElement("span")
+    clone = _span.cloneNode  # bind the JS methods once for the whole batch
+    frag = document.createDocumentFragment()
+    append = frag.appendChild
+    for css_class, text in _pending:
+        span = clone(False)
+        span.className = css_class
+        span.textContent = text
+        append(span)
+    _pending.clear()
+    output.appendChild(frag)
+    output.scrollTop = output.scrollHeight
+
+
+def log(msg: str, css_class: str = "info", level: int = INFO) -> None:
+    """Queue a message for the output div unless level is below LOG_LEVEL."""
+    global _flush_proxy, _flush_scheduled
+    if level < LOG_LEVEL:
+        return
+    if document is None:
+        print(msg)
+        return
+    _pending.append((css_class, f"[{timestamp()}] {msg}\n"))
+    if not _flush_scheduled:
+        if _flush_proxy is None:
+            _flush_proxy = create_proxy(_flush)
+        js.requestAnimationFrame(_flush_proxy)
+        _flush_scheduled = True
+
+
+def log_exc() -> None:
+    """Log the handled exception's traceback at DEBUG, formatting it only then."""
+    if DEBUG < LOG_LEVEL:
+        return
+    log(traceback.format_exc(), "fail", DEBUG)
+
+
+def clear_output() -> None:
+    """Clear the output div and drop any lines not yet written."""
+    _pending.clear()
+    if document is None:
+        return
+    output = _get_output()
+    if output is not None:
+        output.innerHTML = ""
@@ -38,7 +38,15 @@ self.enqueueLiboqsLog = enqueueLog;
 self.flushLiboqsLogs = flushLogs;
 self.enqueueLiboqsLogJson = (payload) => {
     try {
-        enqueueLog(JSON.parse(payload));
+        const parsed = JSON.parse(payload);
+        if (Array.isArray(parsed)) {
+            // batched entries from the Python side
+            for (const entry of parsed) {
+                enqueueLog(entry);
+            }
+        } else {
+            enqueueLog(parsed);
+        }
     } catch (err) {
         enqueueLog({
             time: new Date().toISOString().split("T")[1].slice(0, 12),
@@ -51,6 +59,7 @@ self.enqueueLiboqsLogJson = (payload) => {
 const PY_FILES = [
     { url: "/python/run_liboqs_worker.py", path: "/run_liboqs_worker.py" },
     { url: "/python/test_runner_doer.py", path: "/test_runner_doer.py" },
+    { url: "/python/ui_log.py", path: "/ui_log.py" },
     { url: "/python/test_loaders.py", path: "/test_loaders.py" },
     { url: "/python/test_kem.py", path: "/test_kem.py" },
     { url: "/python/test_sig.py", path: "/test_sig.py" },
@@ -135,7 +144,12 @@ self.onmessage = async (event) => {
         flushLogs();
         self.postMessage({ type: "status", state: "done" });
     } catch (err) {
-        flushLogs();
+        try {
+            // entries still batched on the Python side
+            pyodide.runPython("import run_liboqs_worker; run_liboqs_worker.flush_logs()");
+        } catch (flushErr) {
+            flushLogs();
+        }
         self.postMessage({
             type: "status",
             state: "error",